@@ -20,7 +20,7 @@ async def init_plugin():
     """插件初始化"""
     logger.info("哔哩哔哩工具开始初始化")
     await pm.start()
-    await pm.registerCallback(notice)
+    pm.register_callback(notice)
 
 @plugin.mount_cleanup_method()
 async def cleanup_plugin():
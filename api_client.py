@@ -1,15 +1,23 @@
 import asyncio
+import copy
+import importlib.util
 import random
 import time
 from enum import Enum
-from typing import Any, Dict, Optional
+from types import MappingProxyType
+from typing import Any, Dict, List, Literal, Mapping, Optional, Tuple
 
 import httpx
 
+try:
+    from orjson import loads as json_loads
+except ImportError:  # 未安装 orjson 时使用标准库
+    from json import loads as json_loads
 
-class RequestType(str, Enum):
-    POST = "post"
-    GET = "get"
+from .conf import config
+
+
+RequestType = Literal["get", "post"]
 
 
 class ApiEndpoints(str, Enum):
@@ -22,6 +30,9 @@ class ApiEndpoints(str, Enum):
     LIVE_ROOM_FANS_MEMBERS_RANK = "https://api.live.bilibili.com/xlive/general-interface/v1/rank/getFansMembersRank"
     LIVE_ROOM_ONLINE_GOLD_RANK = "https://api.live.bilibili.com/xlive/general-interface/v1/rank/getOnlineGoldRank"
     LIVE_ROOM_DANMU = "https://api.live.bilibili.com/ajax/msg"
+    LIVE_ROOMS_BASE_INFO = (
+        "https://api.live.bilibili.com/xlive/web-room/v1/index/getRoomBaseInfo"
+    )
 
 
 class DefaultHeaders:
@@ -38,6 +49,9 @@ class DefaultHeaders:
         "Accept-Language": "zh-CN,zh;q=0.9",
         "Origin": "https://live.bilibili.com",
     }
+    # 只读副本，可直接传给 httpx 而无需每次复制
+    BASE_HEADERS_FROZEN = MappingProxyType(dict(BASE_HEADERS))
+    LIVE_HEADERS_FROZEN = MappingProxyType(dict(LIVE_HEADERS))
 
 
 class ApiClientError(Exception):
@@ -45,30 +59,161 @@ class ApiClientError(Exception):
 
 
 class ApiClient:
-    def __init__(self, timeout: int = 10, max_retries: int = 3):
+    # 指数退避参数（秒）
+    BACKOFF_BASE = 0.5
+    BACKOFF_CAP = 20.0
+    # 需要重试的 HTTP 状态码
+    RETRY_STATUS_CODES = frozenset({408, 425, 429, 500, 502, 503, 504})
+    # 响应缓存最大条目数
+    CACHE_MAXSIZE = 512
+
+    def __init__(
+        self,
+        timeout: int = 10,
+        max_retries: int = 3,
+        cache_ttl: float = 5.0,
+        max_concurrency: int = 32,
+    ):
         """
         初始化 API 客户端
 
         Args:
             timeout: 请求超时时间（秒）
             max_retries: 最大重试次数
+            cache_ttl: 响应缓存有效期（秒）
+            max_concurrency: 最大并发请求数
         """
         self.timeout = timeout
         self.max_retries = max_retries
+        self.cache_ttl = cache_ttl
+
+        # 限制同时发出的请求数量
+        self._gate = asyncio.Semaphore(max_concurrency)
+
+        # 响应缓存: (端点, 参数) -> (过期时间, 数据)
+        self._cache: Dict[Tuple[Any, ...], Tuple[float, Dict[str, Any]]] = {}
+        # 进行中的请求: (端点, 参数) -> Future，用于合并并发的重复请求
+        self._inflight: Dict[Tuple[Any, ...], asyncio.Future] = {}
+        # 弹幕接口按房间缓存的请求头
+        self._danmu_headers_cache: Dict[int, Mapping[str, str]] = {}
+
+        # 连接阶段的失败由传输层直接重试，无需回到重试循环
+        transport = httpx.AsyncHTTPTransport(
+            retries=2,
+            # 未安装 h2 时回退到 HTTP/1.1，避免插件加载失败
+            http2=importlib.util.find_spec("h2") is not None,
+            limits=httpx.Limits(
+                max_connections=64,
+                max_keepalive_connections=32,
+                keepalive_expiry=30.0,
+            ),
+        )
 
         # 创建 httpx 异步客户端
         self.client = httpx.AsyncClient(
-            timeout=timeout,
+            transport=transport,
+            timeout=httpx.Timeout(timeout, connect=5.0),
             headers=DefaultHeaders.BASE_HEADERS,
             follow_redirects=True,
         )
 
+    @staticmethod
+    def _cache_key(endpoint: str, params: Dict[str, Any]) -> Tuple[Any, ...]:
+        """
+        生成缓存键，忽略仅用于防缓存的 ts 参数
+
+        Args:
+            endpoint: API 端点
+            params: 查询参数
+
+        Returns:
+            缓存键
+        """
+        return (
+            endpoint,
+            tuple(
+                sorted(
+                    (k, tuple(v) if isinstance(v, list) else v)
+                    for k, v in params.items()
+                    if k != "ts"
+                ),
+            ),
+        )
+
+    def _cache_get(self, key: Tuple[Any, ...]) -> Optional[Dict[str, Any]]:
+        """
+        读取未过期的缓存数据
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            缓存数据的副本，未命中时返回 None
+        """
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        expires_at, data = entry
+        if expires_at <= time.monotonic():
+            del self._cache[key]
+            return None
+        return copy.deepcopy(data)
+
+    def _cache_set(self, key: Tuple[Any, ...], data: Dict[str, Any]) -> None:
+        """
+        写入缓存，超出容量时先清理过期条目，再淘汰最早写入的条目
+
+        Args:
+            key: 缓存键
+            data: 需要缓存的数据
+        """
+        now = time.monotonic()
+        if key not in self._cache and len(self._cache) >= self.CACHE_MAXSIZE:
+            for expired in [k for k, (exp, _) in self._cache.items() if exp <= now]:
+                del self._cache[expired]
+            if len(self._cache) >= self.CACHE_MAXSIZE:
+                del self._cache[next(iter(self._cache))]
+        self._cache[key] = (now + self.cache_ttl, copy.deepcopy(data))
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """
+        计算带完全抖动的指数退避时间
+
+        Args:
+            attempt: 当前重试次数（从 1 开始）
+
+        Returns:
+            本次等待的秒数
+        """
+        return random.uniform(
+            0, min(self.BACKOFF_CAP, self.BACKOFF_BASE * 2 ** (attempt - 1))
+        )
+
+    def _retry_after(self, response: httpx.Response) -> Optional[float]:
+        """
+        解析响应中的 Retry-After 头
+
+        Args:
+            response: httpx.Response 对象
+
+        Returns:
+            服务端要求的等待秒数，无法解析时返回 None
+        """
+        value = response.headers.get("Retry-After")
+        if value is None:
+            return None
+        try:
+            delay = float(value)
+        except ValueError:
+            return None
+        return min(max(delay, 0.0), self.BACKOFF_CAP)
+
     async def _make_request(
         self,
         url: str,
         method: RequestType,
         params: Optional[Dict[str, Any]] = None,
-        headers: Optional[Dict[str, str]] = None,
+        headers: Optional[Mapping[str, str]] = None,
         **kwargs,
     ) -> httpx.Response:
         """
@@ -79,7 +224,7 @@ class ApiClient:
             method: 请求方法
             params: 查询参数
             headers: 请求头
-            **kwargs: 其他 httpx 参数
+            **kwargs: 其他 httpx 请求构建参数
 
         Returns:
             httpx.Response 对象
@@ -87,36 +232,44 @@ class ApiClient:
         Raises:
             ApiClientError: 请求失败时抛出
         """
-        # 合并 headers
-        request_headers = DefaultHeaders.BASE_HEADERS.copy()
-        if headers:
-            request_headers.update(headers)
+        # httpx 会把请求头合并到客户端默认头之上，这里无需复制
+        request_headers = (
+            DefaultHeaders.BASE_HEADERS_FROZEN if headers is None else headers
+        )
+
+        request = self.client.build_request(
+            method.upper(),
+            url,
+            params=params,
+            headers=request_headers,
+            **kwargs,
+        )
 
         for attempt in range(1, self.max_retries + 1):
             try:
-                if method == RequestType.GET:
-                    response = await self.client.get(
-                        url,
-                        params=params,
-                        headers=request_headers,
-                        **kwargs,
-                    )
-                elif method == RequestType.POST:
-                    response = await self.client.post(
-                        url,
-                        params=params,
-                        headers=request_headers,
-                        **kwargs,
-                    )
-                else:
-                    raise ApiClientError(f"不支持的请求方法: {method}")
+                async with self._gate:
+                    # 以流式接收，需要重试的响应不读取响应体
+                    response = await self.client.send(request, stream=True)
+                    try:
+                        retry = (
+                            response.status_code in self.RETRY_STATUS_CODES
+                            and attempt < self.max_retries
+                        )
+                        if not retry:
+                            await response.aread()
+                    finally:
+                        await response.aclose()
+
+            except (httpx.ConnectError, httpx.ConnectTimeout) as e:
+                # 连接失败已由传输层重试，不再叠加一层重试
+                raise ApiClientError(f"连接失败: {e}") from e
 
             except httpx.TimeoutException as e:
                 if attempt == self.max_retries:
                     raise ApiClientError(
                         f"请求超时（重试 {self.max_retries} 次后）: {e}",
                     ) from e
-                await asyncio.sleep(random.uniform(1, 2))
+                await asyncio.sleep(self._backoff_delay(attempt))
                 continue
 
             except httpx.RequestError as e:
@@ -124,10 +277,16 @@ class ApiClient:
                     raise ApiClientError(
                         f"请求失败（重试 {self.max_retries} 次后）: {e}",
                     ) from e
-                await asyncio.sleep(random.uniform(1, 2))
+                await asyncio.sleep(self._backoff_delay(attempt))
                 continue
 
             else:
+                if retry:
+                    await asyncio.sleep(
+                        self._retry_after(response)
+                        or self._backoff_delay(attempt)
+                    )
+                    continue
                 response.raise_for_status()
                 return response
 
@@ -136,41 +295,156 @@ class ApiClient:
 
 
 
-    async def get_live_room_info(self, room_id: int) -> Dict[str, Any]:
+    async def _call_json_api(
+        self,
+        endpoint: ApiEndpoints,
+        params: Dict[str, Any],
+        *,
+        err_msg: str,
+        headers: Optional[Mapping[str, str]] = None,
+        use_cache: bool = True,
+    ) -> Dict[str, Any]:
         """
-        获取直播间信息
+        调用返回 JSON 的 API 并取出 data 字段
 
         Args:
-            room_id: 直播间 ID
+            endpoint: API 端点
+            params: 查询参数
+            err_msg: 失败时的错误信息前缀
+            headers: 额外请求头
+            use_cache: 是否使用响应缓存
 
         Returns:
-            直播间信息字典
+            API 返回的 data 字段
 
         Raises:
             ApiClientError: API 调用失败时抛出
         """
-        params = {"room_id": room_id}
-        headers = DefaultHeaders.BASE_HEADERS.copy()
+        key = self._cache_key(endpoint, params)
+        if use_cache:
+            cached = self._cache_get(key)
+            if cached is not None:
+                return cached
+
+        # 相同请求正在进行时直接等待其结果
+        while (inflight := self._inflight.get(key)) is not None:
+            try:
+                return copy.deepcopy(await asyncio.shield(inflight))
+            except asyncio.CancelledError:
+                # 仅当发起者被取消时才接替它重新请求，自身被取消则继续抛出
+                if not inflight.cancelled() or self._is_cancelling():
+                    raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await self._fetch_json_api(endpoint, params, err_msg, headers)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # 没有等待者时避免 "exception was never retrieved" 警告
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            self._inflight.pop(key, None)
+
+        if use_cache:
+            self._cache_set(key, result)
+        return result
+
+    @staticmethod
+    def _is_cancelling() -> bool:
+        """当前任务是否正在被取消（Python 3.11+ 才能判断）"""
+        task = asyncio.current_task()
+        cancelling = getattr(task, "cancelling", None)
+        return bool(cancelling and cancelling())
+
+    async def _fetch_json_api(
+        self,
+        endpoint: ApiEndpoints,
+        params: Dict[str, Any],
+        err_msg: str,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        发送请求并解析 JSON 响应中的 data 字段
+
+        Args:
+            endpoint: API 端点
+            params: 查询参数
+            err_msg: 失败时的错误信息前缀
+            headers: 额外请求头
 
-        def _handle_api_error(data: Dict[str, Any]) -> None:
-            """处理 API 错误响应"""
-            raise ApiClientError(data.get("message", "未知 API 错误"))
+        Returns:
+            API 返回的 data 字段
 
+        Raises:
+            ApiClientError: API 调用失败时抛出
+        """
         try:
             response = await self._make_request(
-                ApiEndpoints.LIVE_ROOM_INFO,
-                RequestType.GET,
+                endpoint,
+                "get",
                 params,
                 headers,
             )
-            data = response.json()
+            data = json_loads(response.content)
             if data.get("code") != 0:
-                _handle_api_error(data)
+                raise ApiClientError(data.get("message", "未知 API 错误"))
             return data["data"]
-        except Exception as e:
-            if isinstance(e, ApiClientError):
-                raise
-            raise ApiClientError(f"获取直播间信息失败: {e}") from e
+        except ApiClientError:
+            raise
+        except (httpx.HTTPError, KeyError, ValueError, AttributeError) as e:
+            raise ApiClientError(f"{err_msg}: {e}") from e
+
+    async def get_live_room_info(self, room_id: int) -> Dict[str, Any]:
+        """
+        获取直播间信息
+
+        Args:
+            room_id: 直播间 ID
+
+        Returns:
+            直播间信息字典
+
+        Raises:
+            ApiClientError: API 调用失败时抛出
+        """
+        return await self._call_json_api(
+            ApiEndpoints.LIVE_ROOM_INFO,
+            {"room_id": room_id},
+            err_msg="获取直播间信息失败",
+        )
+
+    async def get_live_rooms_info(self, room_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        批量获取多个直播间的基础信息
+
+        Args:
+            room_ids: 直播间 ID 列表
+
+        Returns:
+            以房间号为键的直播间信息字典
+
+        Raises:
+            ApiClientError: API 调用失败时抛出
+        """
+        params = {
+            "room_ids": list(room_ids),
+            "req_biz": "web_room_componet",
+        }
+        data = await self._call_json_api(
+            ApiEndpoints.LIVE_ROOMS_BASE_INFO,
+            params,
+            err_msg="批量获取直播间信息失败",
+            use_cache=False,
+        )
+        by_room_ids = (data or {}).get("by_room_ids") or {}
+        return {int(room_id): info for room_id, info in by_room_ids.items()}
 
     async def get_live_room_guard_tab(
         self,
@@ -203,27 +477,11 @@ class ApiClient:
             "page_size": page_size,
             "typ": sort,
         }
-        headers = DefaultHeaders.BASE_HEADERS.copy()
-
-        def _handle_api_error(data: Dict[str, Any]) -> None:
-            """处理 API 错误响应"""
-            raise ApiClientError(data.get("message", "未知 API 错误"))
-
-        try:
-            response = await self._make_request(
-                ApiEndpoints.LIVE_ROOM_GUARD_TAB,
-                RequestType.GET,
-                params,
-                headers,
-            )
-            data = response.json()
-            if data.get("code") != 0:
-                _handle_api_error(data)
-            return data["data"]
-        except Exception as e:
-            if isinstance(e, ApiClientError):
-                raise
-            raise ApiClientError(f"获取大航海成员失败: {e}") from e
+        return await self._call_json_api(
+            ApiEndpoints.LIVE_ROOM_GUARD_TAB,
+            params,
+            err_msg="获取大航海成员失败",
+        )
 
     async def get_live_room_fans_members_rank(
         self,
@@ -252,29 +510,13 @@ class ApiClient:
             "page": page,
             "page_size": page_size,
             "rank_type": rank_type,
-            "ts": int(time.time() * 1000),  # 13 位时间戳
+            "ts": time.time_ns() // 1_000_000,  # 13 位时间戳
         }
-        headers = DefaultHeaders.BASE_HEADERS.copy()
-
-        def _handle_api_error(data: Dict[str, Any]) -> None:
-            """处理 API 错误响应"""
-            raise ApiClientError(data.get("message", "未知 API 错误"))
-
-        try:
-            response = await self._make_request(
-                ApiEndpoints.LIVE_ROOM_FANS_MEMBERS_RANK,
-                RequestType.GET,
-                params,
-                headers,
-            )
-            data = response.json()
-            if data.get("code") != 0:
-                _handle_api_error(data)
-            return data["data"]
-        except Exception as e:
-            if isinstance(e, ApiClientError):
-                raise
-            raise ApiClientError(f"获取粉丝团成员排行失败: {e}") from e
+        return await self._call_json_api(
+            ApiEndpoints.LIVE_ROOM_FANS_MEMBERS_RANK,
+            params,
+            err_msg="获取粉丝团成员排行失败",
+        )
 
     async def get_live_room_online_gold_rank(
         self,
@@ -304,27 +546,11 @@ class ApiClient:
             "page": page,
             "pageSize": page_size,
         }
-        headers = DefaultHeaders.BASE_HEADERS.copy()
-
-        def _handle_api_error(data: Dict[str, Any]) -> None:
-            """处理 API 错误响应"""
-            raise ApiClientError(data.get("message", "未知 API 错误"))
-
-        try:
-            response = await self._make_request(
-                ApiEndpoints.LIVE_ROOM_ONLINE_GOLD_RANK,
-                RequestType.GET,
-                params,
-                headers,
-            )
-            data = response.json()
-            if data.get("code") != 0:
-                _handle_api_error(data)
-            return data["data"]
-        except Exception as e:
-            if isinstance(e, ApiClientError):
-                raise
-            raise ApiClientError(f"获取在线金瓜子排行失败: {e}") from e
+        return await self._call_json_api(
+            ApiEndpoints.LIVE_ROOM_ONLINE_GOLD_RANK,
+            params,
+            err_msg="获取在线金瓜子排行失败",
+        )
 
     async def get_live_room_danmu(self, room_id: int) -> Dict[str, Any]:
         """
@@ -339,29 +565,67 @@ class ApiClient:
         Raises:
             ApiClientError: API 调用失败时抛出
         """
-        params = {"roomid": room_id}
-        headers = DefaultHeaders.LIVE_HEADERS.copy()
-        headers["Referer"] = f"https://live.bilibili.com/{room_id}"
+        headers = self._danmu_headers_cache.get(room_id)
+        if headers is None:
+            headers = MappingProxyType(
+                {
+                    **DefaultHeaders.LIVE_HEADERS_FROZEN,
+                    "Referer": f"https://live.bilibili.com/{room_id}",
+                },
+            )
+            self._danmu_headers_cache[room_id] = headers
+        return await self._call_json_api(
+            ApiEndpoints.LIVE_ROOM_DANMU,
+            {"roomid": room_id},
+            err_msg="获取弹幕信息失败",
+            headers=headers,
+            use_cache=False,
+        )
+
+    async def get_live_room_bundle(self, room_id: int, page: int = 1) -> Dict[str, Any]:
+        """
+        并发获取直播间信息、大航海、粉丝团排行、在线金瓜子排行与弹幕
 
-        def _handle_api_error(data: Dict[str, Any]) -> None:
-            """处理 API 错误响应"""
-            raise ApiClientError(data.get("message", "未知 API 错误"))
+        Args:
+            room_id: 直播间 ID
+            page: 排行类接口的页码
 
-        try:
-            response = await self._make_request(
-                ApiEndpoints.LIVE_ROOM_DANMU,
-                RequestType.GET,
-                params,
-                headers,
+        Returns:
+            包含 info、guard_tab、fans_members_rank、online_gold_rank、danmu
+            的字典，除 info 外获取失败的项为 None
+
+        Raises:
+            ApiClientError: 获取直播间信息失败时抛出
+        """
+        info, danmu = await asyncio.gather(
+            self.get_live_room_info(room_id),
+            self.get_live_room_danmu(room_id),
+            return_exceptions=True,
+        )
+        if isinstance(info, BaseException):
+            raise info
+
+        real_room_id = info.get("room_id") or room_id
+        ruid = info.get("uid")
+        guard_tab = fans_members_rank = online_gold_rank = None
+        if ruid:
+            guard_tab, fans_members_rank, online_gold_rank = await asyncio.gather(
+                self.get_live_room_guard_tab(real_room_id, ruid, page),
+                self.get_live_room_fans_members_rank(ruid, page),
+                self.get_live_room_online_gold_rank(real_room_id, ruid, page),
+                return_exceptions=True,
             )
-            data = response.json()
-            if data.get("code") != 0:
-                _handle_api_error(data)
-            return data["data"]
-        except Exception as e:
-            if isinstance(e, ApiClientError):
-                raise
-            raise ApiClientError(f"获取弹幕信息失败: {e}") from e
+
+        def _ok(result: Any) -> Optional[Dict[str, Any]]:
+            return None if isinstance(result, BaseException) else result
+
+        return {
+            "info": info,
+            "guard_tab": _ok(guard_tab),
+            "fans_members_rank": _ok(fans_members_rank),
+            "online_gold_rank": _ok(online_gold_rank),
+            "danmu": _ok(danmu),
+        }
 
     async def aclose(self):
         """关闭客户端连接"""
@@ -375,48 +639,4 @@ class ApiClient:
         await self.aclose()
 
 
-api = ApiClient()
-
-
-async def main():
-    """
-    测试 API 客户端功能
-    """
-
-    try:
-        async with api:
-            # 测试获取直播间信息
-            print("=== 获取直播间信息 ===")
-            room_info = await api.get_live_room_info(32444461)
-            print(f"直播间标题: {room_info.get('title', 'N/A')}")
-            print(f"直播状态: {bool(room_info.get('live_status', 'N/A'))}")
-            print(f"人气值: {room_info.get('online', 'N/A')}")
-
-            # 获取主播 UID 用于其他 API 调用
-            ruid = room_info.get("uid")
-            print(ruid)
-            if ruid:
-                print("\n=== 获取大航海成员 ===")
-                guard_info = await api.get_live_room_guard_tab(32444461, ruid, 1)
-                print(
-                    f"大航海成员数量: {sum(1 for item in guard_info['list'] + guard_info['top3'] if item.get('uinfo', {}).get('medal', {}).get('guard_level', 0) == 3)}",
-                )
-
-                print("\n=== 获取粉丝团排行 ===")
-                fans_rank = await api.get_live_room_fans_members_rank(ruid, 1)
-                print(f"粉丝团成员数量: {len(fans_rank['item'])}")
-
-            print("\n=== 获取弹幕信息 ===")
-            danmu_info = await api.get_live_room_danmu(32444461)
-            print(f"弹幕数量: {len(danmu_info.get('data', []))}")
-
-    except ApiClientError as e:
-        print(f"API 错误: {e}")
-    except Exception as e:
-        print(f"未知错误: {e}")
-
-
-if __name__ == "__main__":
-    import asyncio
-
-    asyncio.run(main())
+api = ApiClient(max_concurrency=config.max_concurrency)
@@ -1,3 +1,5 @@
+from typing import List
+
 from pydantic import Field
 
 from nekro_agent.api.plugin import ConfigBase, NekroPlugin
@@ -37,6 +39,12 @@ class BasicConfig(ConfigBase):
         title="房间号",
     )
 
+    room_ids: List[int] = Field(
+        default_factory=list,
+        title="额外房间号",
+        description="需要同时监控的其他直播间房间号，与房间号合并后一次请求批量查询，通知中使用B站返回的主播昵称",
+    )
+
     streamer_name: str = Field(
         default="主播",
         title="主播名字",
@@ -49,6 +57,13 @@ class BasicConfig(ConfigBase):
         description="是否@全体成员",
     )
 
+    max_concurrency: int = Field(
+        default=32,
+        ge=1,
+        title="最大并发请求数",
+        description="同时向B站API发出的最大请求数",
+    )
+
     is_push_system: bool = Field(
         default=True,
         title="是否唤醒AI",
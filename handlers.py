@@ -1,3 +1,6 @@
+from functools import lru_cache
+from typing import Dict
+
 from nonebot import get_bot
 from nonebot.adapters.onebot.v11 import MessageSegment
 
@@ -8,6 +11,28 @@ from .conf import config
 from .models import NotificationType, RoomInfo
 
 
+@lru_cache(maxsize=32)
+def _message_templates(
+    streamer_name: str, is_at_all: bool
+) -> Dict[NotificationType, str]:
+    """按主播名与配置预先生成通知模板，变化时自动重新生成"""
+    at_prefix = f"{MessageSegment.at('all')} " if is_at_all else ""
+    name = streamer_name.replace("{", "{{").replace("}", "}}")
+    return {
+        NotificationType.LIVE_START: (
+            f"{at_prefix}{name}开播啦!\n地址: https://live.bilibili.com/{{room_id}} \n标题:{{title}}"
+        ),
+        NotificationType.LIVE_END: f"{at_prefix}{name}下播啦!",
+    }
+
+
+def _streamer_name(room_info: RoomInfo) -> str:
+    """主房间使用配置的主播名字，额外房间使用 API 返回的主播昵称"""
+    if config.room_id in (room_info.room_id, room_info.short_id):
+        return config.streamer_name
+    return room_info.uname or "主播"
+
+
 async def notice(
     room_info: RoomInfo,
     notification_type: NotificationType = NotificationType.LIVE_START):
@@ -19,18 +44,10 @@ async def notice(
     if not config.notification_group:
         logger.warning("未配置通知群号，跳过发送通知")
         return
-    if config.is_at_all:
-        at = MessageSegment.at("all")
-
-        if notification_type == NotificationType.LIVE_END:
-            message = f"{at} {config.streamer_name}下播啦!"
-        elif notification_type == NotificationType.LIVE_START:
-            message = f"{at} {config.streamer_name}开播啦!\n地址: https://live.bilibili.com/{room_info.room_id} \n标题:{room_info.title}"
-    else:
-        if notification_type == NotificationType.LIVE_END:
-            message = f"{config.streamer_name}下播啦!"
-        elif notification_type == NotificationType.LIVE_START:
-            message = f"{config.streamer_name}开播啦!\n地址: https://live.bilibili.com/{room_info.room_id} \n标题:{room_info.title}"
+
+    message = _message_templates(_streamer_name(room_info), config.is_at_all)[
+        notification_type
+    ].format(room_id=room_info.room_id, title=room_info.title)
 
     if config.is_push_system:
         await message_service.push_system_message(
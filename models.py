@@ -1,10 +1,24 @@
-import json
-from dataclasses import dataclass, field
+import asyncio
+import os
+from dataclasses import asdict, dataclass, field
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Union
 
-from pydantic import BaseModel, Field
+try:
+    import orjson
+except ImportError:  # 未安装 orjson 时使用标准库
+    orjson = None
+    import json
+
+
+def _atomic_write_bytes(file_path: Union[str, Path], data: bytes) -> None:
+    """先写入临时文件再替换，避免中途失败留下损坏的文件"""
+    path = Path(file_path)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
 
 
 class NotificationType(Enum):
@@ -12,7 +26,7 @@ class NotificationType(Enum):
     LIVE_END = "live_end"
 
 
-@dataclass
+@dataclass(slots=True)
 class RoomInfo:
     """直播间信息"""
 
@@ -35,6 +49,8 @@ class RoomInfo:
     verify: str = ""
     new_pendants: dict = field(default_factory=dict)
     up_session: Optional[str] = None
+    uname: Optional[str] = None  # 主播昵称
+    short_id: int = 0  # 短房间号，没有时为 0
     pk_status: int = 0
     pk_id: int = 0
     battle_id: int = 0
@@ -43,32 +59,37 @@ class RoomInfo:
     studio_info: dict = field(default_factory=dict)
 
 
-class RoomStatus(BaseModel):
+@dataclass(slots=True, frozen=True)
+class RoomStatus:
     """开播信息存储"""
 
-    room_id: int = Field(..., description="房间号")
-    live_status: bool = Field(..., description="是否开播")
+    room_id: int  # 房间号
+    live_status: bool  # 是否开播
 
-    def save_to_json(self, file_path: str) -> bool:
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RoomStatus":
+        """从字典构造并规范字段类型"""
+        return cls(room_id=int(data["room_id"]), live_status=bool(data["live_status"]))
+
+    @classmethod
+    def save_all(
+        cls, statuses: Dict[int, "RoomStatus"], file_path: Union[str, Path]
+    ) -> bool:
         """
-        保存直播状态到JSON文件
+        将多个直播间的状态保存到同一个JSON文件，调用方需确保目录已存在
 
         Args:
-            file_path: JSON文件路径，如果为None则使用默认路径
+            statuses: 以房间号为键的直播状态
+            file_path: JSON文件路径
 
         Returns:
             bool: 保存是否成功
         """
         try:
-            # 确保目录存在
-            Path(file_path).parent.mkdir(parents=True, exist_ok=True)
-
-            # 转换为字典并保存
-            data = self.model_dump()
-
-            with Path(file_path).open("w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-
+            _atomic_write_bytes(
+                file_path,
+                b"[\n" + b",\n".join(map(_status_blob, statuses.values())) + b"\n]",
+            )
         except Exception as e:
             print(f"保存直播状态到JSON文件失败: {e}")
             return False
@@ -76,28 +97,51 @@ class RoomStatus(BaseModel):
             return True
 
     @classmethod
-    def load_from_json(cls, file_path: Optional[str] = None) -> Optional["RoomStatus"]:
+    def load_all(cls, file_path: Union[str, Path]) -> Dict[int, "RoomStatus"]:
         """
-        从JSON文件加载直播状态
+        从JSON文件加载所有直播间的状态，兼容旧版单房间格式
 
         Args:
-            file_path: JSON文件路径，如果为None则使用默认路径
+            file_path: JSON文件路径
 
         Returns:
-            RoomStatus: 直播状态对象，如果加载失败返回None
+            Dict[int, RoomStatus]: 以房间号为键的直播状态，加载失败返回空字典
         """
         try:
-            if file_path is None:
-                # 使用默认路径：当前目录下的room_status.json
-                file_path = str(Path(__file__).parent / "room_status.json")
-
             if not Path(file_path).exists():
-                return None
+                return {}
 
-            with Path(file_path).open("r", encoding="utf-8") as f:
-                data = json.load(f)
-
-            return cls(**data)
+            raw = Path(file_path).read_bytes()
+            data = orjson.loads(raw) if orjson else json.loads(raw)
+            if isinstance(data, dict):
+                data = [data]
+            statuses = [cls.from_dict(item) for item in data]
         except Exception as e:
             print(f"从JSON文件加载直播状态失败: {e}")
-            return None
+            return {}
+        else:
+            return {status.room_id: status for status in statuses}
+
+    @classmethod
+    async def asave_all(
+        cls, statuses: Dict[int, "RoomStatus"], file_path: Union[str, Path]
+    ) -> bool:
+        """在线程中保存所有直播间的状态，避免阻塞事件循环"""
+        return await asyncio.to_thread(cls.save_all, dict(statuses), file_path)
+
+    @classmethod
+    async def aload_all(cls, file_path: Union[str, Path]) -> Dict[int, "RoomStatus"]:
+        """在线程中加载所有直播间的状态，避免阻塞事件循环"""
+        return await asyncio.to_thread(cls.load_all, file_path)
+
+
+@lru_cache(maxsize=256)
+def _status_blob(status: RoomStatus) -> bytes:
+    """
+    缓存单条直播状态的序列化结果
+
+    每个房间只有开播/未开播两种状态，状态切换时直接复用已序列化的字节
+    """
+    if orjson:
+        return orjson.dumps(asdict(status))
+    return json.dumps(asdict(status), separators=(",", ":")).encode()
@@ -1,6 +1,7 @@
 import asyncio
 import contextlib
-from typing import Callable, Optional
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
 
 from nekro_agent.api.core import logger
 
@@ -8,22 +9,99 @@ from .api_client import api
 from .conf import config, plugin
 from .models import NotificationType, RoomInfo, RoomStatus
 
+# RoomInfo 字段按类型分组，供 _convert_to_room_info 统一转换
+_STR_FIELDS = ("title", "live_time", "area_name", "room_silent_type", "verify")
+_OPT_STR_FIELDS = ("user_cover", "keyframe", "background", "up_session", "uname")
+_INT_FIELDS = (
+    "online",
+    "attention",
+    "room_silent_level",
+    "room_silent_second",
+    "pk_status",
+    "pk_id",
+    "battle_id",
+    "allow_change_area_time",
+    "allow_upload_cover_time",
+    "short_id",
+)
+_BOOL_FIELDS = ("live_status", "is_strict_room")
+_DICT_FIELDS = ("new_pendants", "studio_info")
+
+
+def _s(value, _str=str) -> str:
+    """转换为字符串，None 转为空字符串"""
+    return "" if value is None else value if type(value) is str else _str(value)
+
+
+def _os(value, _str=str) -> Optional[str]:
+    """转换为字符串，保留 None"""
+    return None if value is None else value if type(value) is str else _str(value)
+
+
+def _as_dict(value) -> dict:
+    return value if isinstance(value, dict) else {}
+
+
+def _safe_int_convert(value, default=0):
+    """
+    安全地将值转换为整数
+
+    Args:
+        value: 要转换的值
+        default: 默认值
+
+    Returns:
+        int: 转换后的整数值
+    """
+    # API 通常直接返回整数，跳过 try 的开销
+    if type(value) is int:
+        return value
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return default
+
+
+_FIELD_CONVERTERS = (
+    (_STR_FIELDS, _s),
+    (_OPT_STR_FIELDS, _os),
+    (_INT_FIELDS, _safe_int_convert),
+    (_BOOL_FIELDS, bool),
+    (_DICT_FIELDS, _as_dict),
+)
+
 
 class PollManager:
     def __init__(self):
         self._running = False
         self._task = None
         self.call_back: Optional[Callable[[RoomInfo, NotificationType], None]] = None
+        # 内存中各直播间的开播记录，写入磁盘时同步更新，仅首次启动时从磁盘加载
+        self._statuses: Dict[int, RoomStatus] = {}
+        self._statuses_loaded = False
+        self._status_path: Optional[Path] = None
+        # 停止信号，用于立即打断轮询间隔的等待
+        self._stop_event = asyncio.Event()
 
     async def start(self):
         if self._running:
             return
 
+        self._status_path = Path(plugin.get_plugin_path()) / "RoomStatus.json"
+        self._status_path.parent.mkdir(parents=True, exist_ok=True)
+        if not self._statuses_loaded:
+            self._statuses = await RoomStatus.aload_all(self._status_path)
+            self._statuses_loaded = True
+
+        self._stop_event.clear()
         self._running = True
         self._task = asyncio.create_task(self._run_tasks())
 
     async def stop(self):
         self._running = False
+        self._stop_event.set()
         if self._task:
             self._task.cancel()
             with contextlib.suppress(asyncio.CancelledError):
@@ -35,82 +113,131 @@ class PollManager:
         while True:
             try:
                 await self._poll_once()
-                await asyncio.sleep(config.check_interval)
+                if await self._wait_stop(config.check_interval):
+                    break
             except asyncio.CancelledError:
                 break
-            except Exception as e:
-                logger.error(f"轮询循环错误: {e}")
-                await asyncio.sleep(min(config.check_interval, 30))
+            except Exception:
+                logger.exception("轮询循环错误")
+                if await self._wait_stop(min(config.check_interval, 30)):
+                    break
+
+    async def _wait_stop(self, timeout: float) -> bool:
+        """
+        等待停止信号
+
+        Args:
+            timeout: 最长等待时间（秒）
+
+        Returns:
+            bool: 是否收到停止信号
+        """
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
 
     async def _poll_once(self):
         try:
-            res = await api.get_live_room_info(config.room_id)
-            if not res:
+            room_ids = self._watched_room_ids()
+            if not room_ids:
+                logger.warning("未配置房间号，跳过轮询")
+                return
+
+            rooms = await api.get_live_rooms_info(room_ids)
+            if not rooms:
                 logger.error("获取直播间信息失败：API返回空数据")
                 return
 
-            room_info = self._convert_to_room_info(res)
-            logger.debug(
-                f"直播间状态解析: live_status={room_info.live_status}, title={room_info.title}"
+            transitions: List[Tuple[RoomInfo, NotificationType]] = []
+            for room_id, res in rooms.items():
+                transition = self._check_room(room_id, res)
+                if transition:
+                    transitions.append(transition)
+
+            if not transitions:
+                return
+
+            # 写入状态文件与通知回调互不依赖，并发执行
+            await asyncio.gather(
+                RoomStatus.asave_all(self._statuses, self._status_path),
+                *(
+                    self._dispatch(room_info, notification_type)
+                    for room_info, notification_type in transitions
+                ),
             )
+        except Exception:
+            logger.exception("轮询直播间信息时发生错误")
+
+    def _watched_room_ids(self) -> List[int]:
+        """合并配置中的房间号，去重并保持顺序"""
+        return [
+            room_id
+            for room_id in dict.fromkeys([config.room_id, *config.room_ids])
+            if room_id
+        ]
+
+    def _check_room(
+        self, room_id: int, res: dict
+    ) -> Optional[Tuple[RoomInfo, NotificationType]]:
+        """
+        比较单个直播间的状态并更新内存记录
 
-            # 获取插件路径用于保存JSON文件
-            path = str(plugin.get_plugin_path()) + "/RoomStatus.json"
-
-            # 检查之前的开播记录
-            previous_status = RoomStatus.load_from_json(path)
-
-            if room_info.live_status:
-                # 当前开播状态
-                if previous_status and previous_status.live_status:
-                    # 之前已经有开播记录，不通知
-                    logger.debug(f"直播间 {room_info.room_id} 已在开播状态，跳过通知")
-                else:
-                    # 检测到新的开播，保存记录并通知
-                    current_status = RoomStatus(
-                        room_id=room_info.room_id, live_status=True
-                    )
-                    current_status.save_to_json(path)
-                    logger.debug(
-                        f"检测到新开播: 房间 {room_info.room_id}, 标题: {room_info.title}"
-                    )
-
-                    if self.call_back:
-                        # 确保回调函数是异步的
-                        if asyncio.iscoroutinefunction(self.call_back):
-                            await self.call_back(room_info, NotificationType.LIVE_START)
-                        else:
-                            self.call_back(room_info, NotificationType.LIVE_START)
-                    else:
-                        logger.warning("回调函数未设置")
+        Args:
+            room_id: 直播间 ID
+            res: 该直播间的 API 数据
+
+        Returns:
+            状态发生变化时返回 (房间信息, 通知类型)，否则返回 None
+        """
+        # 检查之前的开播记录，状态未变化时无需完整解析
+        previous_status = self._statuses.get(room_id)
+        previous_live = bool(previous_status and previous_status.live_status)
+        live_status = bool(res.get("live_status", 0))
+        if live_status == previous_live:
+            if previous_live:
+                logger.debug("直播间 {} 已在开播状态，跳过通知", room_id)
             else:
-                # 当前未开播状态，更新记录
-                if previous_status and previous_status.live_status:
-                    # 从开播状态变为未开播，更新记录
-                    current_status = RoomStatus(
-                        room_id=room_info.room_id, live_status=False
-                    )
-                    current_status.save_to_json(path)
-                    if self.call_back:
-                        # 确保回调函数是异步的
-                        if asyncio.iscoroutinefunction(self.call_back):
-                            await self.call_back(room_info, NotificationType.LIVE_END)
-                        else:
-                            self.call_back(room_info, NotificationType.LIVE_END)
-                else:
-                    logger.debug("主播未开播")
-        except Exception as e:
-            logger.error(f"轮询直播间信息时发生错误: {e}")
-            import traceback
+                logger.debug("直播间 {} 未开播", room_id)
+            return None
+
+        room_info = self._convert_to_room_info(res, room_id)
+        logger.debug(
+            "直播间状态解析: live_status={}, title={}",
+            room_info.live_status,
+            room_info.title,
+        )
 
-            logger.error(f"详细错误信息: {traceback.format_exc()}")
+        self._statuses[room_id] = RoomStatus(room_id=room_id, live_status=live_status)
+        if live_status:
+            logger.debug("检测到新开播: 房间 {}, 标题: {}", room_id, room_info.title)
+            return room_info, NotificationType.LIVE_START
+        return room_info, NotificationType.LIVE_END
 
-    def _convert_to_room_info(self, api_data: dict) -> RoomInfo:
+    async def _dispatch(self, room_info: RoomInfo, notification_type: NotificationType):
+        """调用已注册的回调函数"""
+        if not self.call_back:
+            logger.warning("回调函数未设置")
+            return
+
+        # 回调异常不应影响状态文件的写入
+        try:
+            # 确保回调函数是异步的
+            if asyncio.iscoroutinefunction(self.call_back):
+                await self.call_back(room_info, notification_type)
+            else:
+                self.call_back(room_info, notification_type)
+        except Exception:
+            logger.exception("通知回调执行失败")
+
+    def _convert_to_room_info(self, api_data: dict, default_room_id: int) -> RoomInfo:
         """
         将API响应数据转换为RoomInfo对象
 
         Args:
             api_data: Bilibili API返回的原始数据
+            default_room_id: room_id 缺失或无效时使用的房间号
 
         Returns:
             RoomInfo: 转换后的房间信息对象
@@ -118,30 +245,24 @@ class PollManager:
         Raises:
             ValueError: 当API数据格式不正确时抛出
         """
+        get = api_data.get
 
         # 验证必要字段
-        room_id = api_data.get("room_id")
+        room_id = get("room_id")
         if not room_id:
-            logger.warning(
-                f"API返回的room_id为空，使用配置中的room_id: {config.room_id}"
-            )
-            room_id = config.room_id
+            logger.warning(f"API返回的room_id为空，使用请求的room_id: {default_room_id}")
+            room_id = default_room_id
         elif not isinstance(room_id, int):
             try:
                 room_id = int(room_id)
             except (ValueError, TypeError):
                 logger.warning(
-                    f"API返回的room_id格式无效: {room_id}，使用配置中的room_id: {config.room_id}"
+                    f"API返回的room_id格式无效: {room_id}，使用请求的room_id: {default_room_id}"
                 )
-                room_id = config.room_id
-
-        # 处理标题，确保是字符串
-        title = api_data.get("title", "")
-        if not isinstance(title, str):
-            title = str(title) if title is not None else ""
+                room_id = default_room_id
 
         # 处理标签数据，API可能返回字符串或列表
-        tags = api_data.get("tags", "")
+        tags = get("tags", "")
         if isinstance(tags, str):
             tags = (
                 [tag.strip() for tag in tags.split(",") if tag.strip()] if tags else []
@@ -153,107 +274,28 @@ class PollManager:
             tags = []
 
         # 处理热词数据
-        hot_words = api_data.get("hot_words", [])
+        hot_words = get("hot_words", [])
         if isinstance(hot_words, list):
             # 确保列表中的所有元素都是字符串
             hot_words = [str(word).strip() for word in hot_words if word is not None]
         else:
             hot_words = []
 
-        # 转换直播状态
-        live_status = bool(api_data.get("live_status", 0))
-
-        # 处理直播时间
-        live_time = api_data.get("live_time", "")
-        if not isinstance(live_time, str):
-            live_time = str(live_time) if live_time is not None else ""
-
-        # 处理区域名称
-        area_name = api_data.get("area_name", "")
-        if not isinstance(area_name, str):
-            area_name = str(area_name) if area_name is not None else ""
-
-        # 处理数值字段，确保类型正确
-        online = self._safe_int_convert(api_data.get("online", 0))
-        attention = self._safe_int_convert(api_data.get("attention", 0))
-        room_silent_level = self._safe_int_convert(api_data.get("room_silent_level", 0))
-        room_silent_second = self._safe_int_convert(
-            api_data.get("room_silent_second", 0)
-        )
-        pk_status = self._safe_int_convert(api_data.get("pk_status", 0))
-        pk_id = self._safe_int_convert(api_data.get("pk_id", 0))
-        battle_id = self._safe_int_convert(api_data.get("battle_id", 0))
-        allow_change_area_time = self._safe_int_convert(
-            api_data.get("allow_change_area_time", 0)
-        )
-        allow_upload_cover_time = self._safe_int_convert(
-            api_data.get("allow_upload_cover_time", 0)
-        )
-
-        # 处理布尔字段
-        is_strict_room = bool(api_data.get("is_strict_room", False))
-
-        # 处理字符串字段，确保类型安全
-        room_silent_type = api_data.get("room_silent_type", "")
-        verify = api_data.get("verify", "")
-        user_cover = api_data.get("user_cover")
-        keyframe = api_data.get("keyframe")
-        background = api_data.get("background")
-        up_session = api_data.get("up_session")
-
-        # 确保字符串字段类型
-        room_silent_type = str(room_silent_type) if room_silent_type is not None else ""
-        verify = str(verify) if verify is not None else ""
-
-        # 确保URL字段类型
-        user_cover = str(user_cover) if user_cover is not None else None
-        keyframe = str(keyframe) if keyframe is not None else None
-        background = str(background) if background is not None else None
-        up_session = str(up_session) if up_session is not None else None
-
-        # 处理字典字段，确保类型安全
-        new_pendants = api_data.get("new_pendants", {})
-        if not isinstance(new_pendants, dict):
-            new_pendants = {}
-
-        studio_info = api_data.get("studio_info", {})
-        if not isinstance(studio_info, dict):
-            studio_info = {}
+        # 按字段类型表统一转换其余字段
+        fields = {
+            name: convert(get(name))
+            for names, convert in _FIELD_CONVERTERS
+            for name in names
+        }
 
         try:
-            return RoomInfo(
-                room_id=room_id,
-                title=title,
-                live_status=live_status,
-                live_time=live_time,
-                area_name=area_name,
-                tags=tags,
-                hot_words=hot_words,
-                online=online,
-                attention=attention,
-                user_cover=user_cover,
-                keyframe=keyframe,
-                is_strict_room=is_strict_room,
-                room_silent_type=room_silent_type,
-                room_silent_level=room_silent_level,
-                room_silent_second=room_silent_second,
-                background=background,
-                verify=verify,
-                new_pendants=new_pendants,
-                up_session=up_session,
-                pk_status=pk_status,
-                pk_id=pk_id,
-                battle_id=battle_id,
-                allow_change_area_time=allow_change_area_time,
-                allow_upload_cover_time=allow_upload_cover_time,
-                studio_info=studio_info,
-            )
+            return RoomInfo(room_id=room_id, tags=tags, hot_words=hot_words, **fields)
         except Exception as e:
             logger.error(f"创建RoomInfo对象时发生错误: {e}")
             # 返回一个基本的RoomInfo对象作为备用
             return RoomInfo(
                 room_id=room_id,
-                title=title or "未知直播间",
+                title=fields["title"] or "未知直播间",
                 live_status=False,
                 live_time="",
                 area_name="",
@@ -263,25 +305,7 @@ class PollManager:
                 attention=0,
             )
 
-    def _safe_int_convert(self, value, default=0):
-        """
-        安全地将值转换为整数
-
-        Args:
-            value: 要转换的值
-            default: 默认值
-
-        Returns:
-            int: 转换后的整数值
-        """
-        if value is None:
-            return default
-        try:
-            return int(value)
-        except (ValueError, TypeError):
-            return default
-
-    async def registerCallback(
+    def register_callback(
         self, callback: Optional[Callable[[RoomInfo, NotificationType], None]] = None
     ):
         self.call_back = callback